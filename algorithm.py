@@ -1,12 +1,14 @@
-from collections import defaultdict
-import matplotlib.pyplot as plt
+from array import array
+import bisect
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 
-class Workstation:
-    idx = 1
-
-    def reset_idx():
-        Workstation.idx = 1
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
+class Workstation:
     def get_overall_performance(workstations):
         """
         Returns the overall performance of the workstations.
@@ -19,12 +21,13 @@ class Workstation:
             overall_performance[w_id] = workstations[w_id].get_performance()
         return overall_performance
     
-    def __init__(self):
-        self.id = Workstation.idx
-        Workstation.idx += 1
+    def __init__(self, id):
+        self.id = id
         self.cycle_time = 0
         self.metabolic_cost = 0
-        self.tasks = []
+        # Task indices are small ints; a typed array stores them contiguously
+        # instead of as a list of boxed objects.
+        self.tasks = array('i')
 
     def add_task(self, task_to_assign, task_time, task_metabolic_cost):
         """
@@ -34,7 +37,7 @@ class Workstation:
         :param task_time: The time of the task.
         :param task_metabolic_cost: The metabolic cost of the task.
         """
-        self.tasks.append(task_to_assign)
+        self.tasks.append(int(task_to_assign))
         self.cycle_time += task_time
         self.metabolic_cost += task_metabolic_cost
 
@@ -50,31 +53,95 @@ class Workstation:
         """
         Returns the tasks assigned to the workstation.
 
-        :return: A list of tasks.
+        :return: An array of task indices.
         """
         return self.tasks
     
 
 class Graph:
     def __init__(self, precedence, tasks, metabolic_costs):
-        self.task_graph, self.indegree = self.build_precedence_graph(precedence)
-        self.available_tasks = [task for task in self.task_graph if self.indegree[task] == 0]
-        self.tasks_times = tasks
-        self.tasks_metabolic_costs = metabolic_costs
+        # Tasks are handled internally as dense integer indices so that times
+        # and metabolic costs can live in numpy arrays; task_ids keeps the
+        # original identifiers for translation at the boundaries. Callers
+        # that already work in index space can pass arrays and index pairs
+        # directly (the shape read_data_file/read_precedence_file produce).
+        if isinstance(tasks, np.ndarray):
+            self.task_ids = list(range(len(tasks)))
+            self.index_of = None
+            self.tasks_times = np.ascontiguousarray(tasks, dtype=np.float64)
+            self.tasks_metabolic_costs = np.ascontiguousarray(metabolic_costs, dtype=np.float64)
+        else:
+            self.task_ids = list(tasks)
+            self.index_of = {task_id: index for index, task_id in enumerate(self.task_ids)}
+            self.tasks_times = np.fromiter(tasks.values(), dtype=np.float64)
+            self.tasks_metabolic_costs = np.fromiter(metabolic_costs.values(), dtype=np.float64)
+            precedence = [(self.index_of[a], self.index_of[b]) for a, b in precedence]
+        self.succ_flat, self.succ_offsets, self.indegree = self.build_precedence_graph(precedence)
+        # Insertion-ordered dict used as a set: O(1) removal while keeping
+        # the deterministic iteration order the first-fit scan relies on.
+        sources = dict.fromkeys(a for a, b in precedence)
+        self.available_tasks = dict.fromkeys(task for task in sources if self.indegree[task] == 0)
+        # Available tasks kept sorted by weight, one list per dimension,
+        # so both the largest-feasible and the lowest-weight selections are
+        # bisect lookups instead of scans.
+        self.sorted_by_time = sorted((self.tasks_times[task], task) for task in self.available_tasks)
+        self.sorted_by_metabolic_cost = sorted((self.tasks_metabolic_costs[task], task) for task in self.available_tasks)
+        # Pristine copies of the mutable state, so one built graph can be
+        # reset and reused across repeated greedy runs.
+        self._initial_indegree = self.indegree.copy()
+        self._initial_available = list(self.available_tasks)
+
+    def reset(self):
+        """
+        Restores the mutable traversal state so the graph can be reused for
+        another greedy run without rebuilding the precedence structure.
+        """
+        self.indegree = self._initial_indegree.copy()
+        self.available_tasks = dict.fromkeys(self._initial_available)
+        self.sorted_by_time = sorted((self.tasks_times[task], task) for task in self.available_tasks)
+        self.sorted_by_metabolic_cost = sorted((self.tasks_metabolic_costs[task], task) for task in self.available_tasks)
+
+    def clone(self):
+        """
+        Returns a graph sharing this graph's immutable structure (weights
+        and precedence arrays) with fresh traversal state, so independent
+        greedy runs can proceed concurrently.
+
+        :return: A new Graph ready for a fresh run.
+        """
+        twin = object.__new__(Graph)
+        twin.task_ids = self.task_ids
+        twin.index_of = self.index_of
+        twin.tasks_times = self.tasks_times
+        twin.tasks_metabolic_costs = self.tasks_metabolic_costs
+        twin.succ_flat = self.succ_flat
+        twin.succ_offsets = self.succ_offsets
+        twin._initial_indegree = self._initial_indegree
+        twin._initial_available = self._initial_available
+        twin.reset()
+        return twin
 
     def build_precedence_graph(self, precedence):
         """
-        Builds the precedence graph and indegree dictionary.
+        Builds the precedence graph in compressed sparse row form, so that
+        successor traversal is a scan of one contiguous buffer.
 
-        :param precedence: A list of tuples representing precedence constraints.
-        :return: A tuple containing the precedence graph and indegree dictionary.
+        :param precedence: A list of tuples representing precedence constraints, as task indices.
+        :return: A tuple containing the flat successor array, the offsets array and the indegree array.
         """
-        task_graph = defaultdict(list)
-        indegree = defaultdict(int)
+        n_tasks = len(self.task_ids)
+        counts = np.zeros(n_tasks + 1, dtype=np.int64)
+        indegree = np.zeros(n_tasks, dtype=np.int64)
         for a, b in precedence:
-            task_graph[a].append(b)
+            counts[a + 1] += 1
             indegree[b] += 1
-        return task_graph, indegree
+        succ_offsets = np.cumsum(counts)
+        succ_flat = np.empty(succ_offsets[-1], dtype=np.int64)
+        cursor = succ_offsets[:-1].copy()
+        for a, b in precedence:
+            succ_flat[cursor[a]] = b
+            cursor[a] += 1
+        return succ_flat, succ_offsets, indegree
 
     def remove_task(self, task):
         """
@@ -82,89 +149,242 @@ class Graph:
 
         :param task: The task to remove.
         """
-        self.available_tasks.remove(task)
-        for dependent_task in self.task_graph[task]:
+        self.available_tasks.pop(task, None)
+        del self.sorted_by_time[bisect.bisect_left(self.sorted_by_time, (self.tasks_times[task], task))]
+        del self.sorted_by_metabolic_cost[bisect.bisect_left(self.sorted_by_metabolic_cost, (self.tasks_metabolic_costs[task], task))]
+        for dependent_task in self.succ_flat[self.succ_offsets[task]:self.succ_offsets[task + 1]]:
+            dependent_task = int(dependent_task)
             self.indegree[dependent_task] -= 1
             if self.indegree[dependent_task] == 0:
-                self.available_tasks.append(dependent_task)
-    
+                self.available_tasks[dependent_task] = None
+                bisect.insort(self.sorted_by_time, (self.tasks_times[dependent_task], dependent_task))
+                bisect.insort(self.sorted_by_metabolic_cost, (self.tasks_metabolic_costs[dependent_task], dependent_task))
+
+    def _peek_lowest(self, sorted_avail, weights):
+        """
+        Returns the head of a sorted availability list. Falls back to the
+        C-implemented builtin min over the available set if the list has
+        run dry.
+
+        :param sorted_avail: The sorted availability list to peek.
+        :param weights: The weight array the list is keyed on.
+        :return: The task with the lowest weight.
+        """
+        if sorted_avail:
+            return sorted_avail[0][1]
+        return min(self.available_tasks, key=weights.__getitem__)
+
     def get_lowest_time_task(self):
         """
         Returns the task with the lowest time.
 
         :return: The task with the lowest time.
         """
-        task_to_assign = self.available_tasks[0]
-        for task in self.available_tasks:
-            if self.tasks_times[task] < self.tasks_times[task_to_assign]:
-                task_to_assign = task
-        return task_to_assign
-    
+        return self._peek_lowest(self.sorted_by_time, self.tasks_times)
+
     def get_lowest_metabolic_cost_task(self):
         """
         Returns the task with the lowest metabolic cost.
 
         :return: The task with the lowest metabolic cost.
         """
-        task_to_assign = self.available_tasks[0]
-        for task in self.available_tasks:
-            if self.tasks_metabolic_costs[task] < self.tasks_metabolic_costs[task_to_assign]:
-                task_to_assign = task
-        return task_to_assign
+        return self._peek_lowest(self.sorted_by_metabolic_cost, self.tasks_metabolic_costs)
     
 
+def _greedy_kernel(weights, indegree, adj_flat, adj_offsets, avail_weights_init, avail_tasks_init, limit, threshold_limit, n_operators, first_ws_id):
+    """
+    Core greedy assignment loop over numeric arrays only, so it can be
+    compiled by numba when available. The available set is kept sorted by
+    (weight, task), so the largest feasible task and the lowest-weight
+    fallback are binary searches instead of scans.
+
+    :param weights: The weight of each task (times or metabolic costs).
+    :param indegree: The indegree of each task.
+    :param adj_flat: The flat successor array of the precedence graph.
+    :param adj_offsets: The offsets array of the precedence graph.
+    :param avail_weights_init: The weights of the initially available tasks, sorted.
+    :param avail_tasks_init: The initially available task indices, sorted by (weight, task).
+    :param limit: The maximum weight allowed per workstation.
+    :param threshold_limit: The relaxed limit including the threshold.
+    :param n_operators: The number of operators available.
+    :param first_ws_id: The ID of the first workstation to open.
+    :return: A tuple containing the tasks in assignment order, the workstation ID per assignment and the last workstation ID.
+    """
+    n_tasks = weights.shape[0]
+    order = np.empty(n_tasks, dtype=np.int64)
+    ws_of = np.empty(n_tasks, dtype=np.int64)
+    avail_weights = np.empty(n_tasks, dtype=np.float64)
+    avail_tasks = np.empty(n_tasks, dtype=np.int64)
+    n_available = avail_tasks_init.shape[0]
+    avail_weights[:n_available] = avail_weights_init
+    avail_tasks[:n_available] = avail_tasks_init
+    n_assigned = 0
+    ws_id = first_ws_id
+    current = 0.0
+    assign_one_more_task = True
+    while n_available > 0:
+        position = -1
+        # Upper bound of the feasible prefix: first entry whose weight
+        # exceeds the remaining capacity.
+        capacity = limit - current
+        lo = 0
+        hi = n_available
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if avail_weights[mid] <= capacity:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo > 0:
+            position = lo - 1
+        else:
+            if current + avail_weights[0] <= threshold_limit or ws_id == n_operators:
+                assign_one_more_task = True
+            if assign_one_more_task:
+                assign_one_more_task = False
+                position = 0
+
+        if position != -1:
+            task_to_assign = avail_tasks[position]
+            for i in range(position, n_available - 1):
+                avail_weights[i] = avail_weights[i + 1]
+                avail_tasks[i] = avail_tasks[i + 1]
+            n_available -= 1
+            order[n_assigned] = task_to_assign
+            ws_of[n_assigned] = ws_id
+            n_assigned += 1
+            current += weights[task_to_assign]
+            for edge in range(adj_offsets[task_to_assign], adj_offsets[task_to_assign + 1]):
+                dependent_task = adj_flat[edge]
+                indegree[dependent_task] -= 1
+                if indegree[dependent_task] == 0:
+                    # Sorted insert by (weight, task)
+                    weight = weights[dependent_task]
+                    lo = 0
+                    hi = n_available
+                    while lo < hi:
+                        mid = (lo + hi) // 2
+                        if avail_weights[mid] < weight or (avail_weights[mid] == weight and avail_tasks[mid] < dependent_task):
+                            lo = mid + 1
+                        else:
+                            hi = mid
+                    for i in range(n_available, lo, -1):
+                        avail_weights[i] = avail_weights[i - 1]
+                        avail_tasks[i] = avail_tasks[i - 1]
+                    avail_weights[lo] = weight
+                    avail_tasks[lo] = dependent_task
+                    n_available += 1
+        else:
+            # Move to the next workstation
+            ws_id += 1
+            current = 0.0
+
+    return order[:n_assigned].copy(), ws_of[:n_assigned].copy(), ws_id
+
+if njit is not None:
+    # nogil lets the two runs in distribution_considering_both overlap on
+    # separate threads.
+    _greedy_kernel = njit(cache=True, nogil=True)(_greedy_kernel)
+
+def _run_greedy_compiled(graph, weights, sorted_avail, limit, threshold_limit, n_operators):
+    """
+    Runs the compiled greedy kernel on a graph and rebuilds the workstations
+    from the returned assignment arrays.
+
+    :param graph: The Graph to distribute.
+    :param weights: The weight array driving the distribution (times or metabolic costs).
+    :param sorted_avail: The graph's sorted availability list for the chosen dimension.
+    :param limit: The maximum weight allowed per workstation.
+    :param threshold_limit: The relaxed limit including the threshold.
+    :param n_operators: The number of operators available.
+    :return: A dictionary where keys are workstation IDs, and values are Workstation objects.
+    """
+    avail_weights_init = np.array([weight for weight, task in sorted_avail], dtype=np.float64)
+    avail_tasks_init = np.array([task for weight, task in sorted_avail], dtype=np.int64)
+    order, ws_of, last_ws_id = _greedy_kernel(
+        weights, graph.indegree.copy(), graph.succ_flat, graph.succ_offsets,
+        avail_weights_init, avail_tasks_init,
+        float(limit), float(threshold_limit), n_operators, 1)
+    return _workstations_from_assignment(graph, order, ws_of, last_ws_id)
+
+def _workstations_from_assignment(graph, order, ws_of, last_ws_id):
+    """
+    Builds Workstation objects from flat assignment arrays. The hot loops
+    only track task order and workstation IDs; boxed Workstation objects
+    exist solely at this boundary.
+
+    :param graph: The Graph the assignment was computed on.
+    :param order: The tasks in assignment order.
+    :param ws_of: The workstation ID per assignment.
+    :param last_ws_id: The ID of the last workstation opened.
+    :return: A dictionary where keys are workstation IDs, and values are Workstation objects.
+    """
+    workstation = Workstation(1)
+    workstations = {workstation.id: workstation}
+    for task, ws_id in zip(order, ws_of):
+        while ws_id != workstation.id:
+            workstation = Workstation(workstation.id + 1)
+            workstations[workstation.id] = workstation
+        task = int(task)
+        workstation.add_task(task, graph.tasks_times[task], graph.tasks_metabolic_costs[task])
+    while workstation.id < last_ws_id:
+        workstation = Workstation(workstation.id + 1)
+        workstations[workstation.id] = workstation
+    return workstations
+
 def read_data_file(data_file):
     """
-    Reads the task data file and returns a dictionary of task times and metabolic costs.
+    Reads the task data file and returns the task times and metabolic costs.
     
+    Task IDs are interned to dense integer indices at load time, so every
+    downstream structure works on small ints instead of hashing strings.
+
     :param data_file: Path to the data file.
-    :return: A dictionary of tasks with their times and metabolic costs.
+    :return: A tuple containing the times array, the metabolic costs array and a dictionary mapping task IDs to indices.
     """
-    tasks = {}
-    metabolic_costs = {}
-    with open(data_file, 'r') as file:
-        for line in file:
-            parts = line.strip().split()
-            task_id = parts[0]
-            time = float(parts[1])
-            metabolic_cost = float(parts[2])
-            tasks[task_id] = time
-            metabolic_costs[task_id] = metabolic_cost
-    return tasks, metabolic_costs
-
-def read_precedence_file(precedence_file):
+    data = np.atleast_1d(np.loadtxt(data_file, dtype=[('id', 'U32'), ('time', 'f8'), ('metabolic_cost', 'f8')]))
+    index_of = {task_id: index for index, task_id in enumerate(data['id'].tolist())}
+    return np.ascontiguousarray(data['time']), np.ascontiguousarray(data['metabolic_cost']), index_of
+
+def read_precedence_file(precedence_file, index_of=None):
     """
     Reads the precedence file and returns a list of precedence constraints.
     
     :param precedence_file: Path to the precedence file.
+    :param index_of: An optional dictionary mapping task IDs to indices; when given, the constraints are returned as index pairs.
     :return: A list of tuples representing precedence constraints.
     """
-    precedence = []
     with open(precedence_file, 'r') as file:
-        for line in file:
-            if '->' in line:
-                parts = line.strip().split('->')
-                precedence.append((parts[0].strip(), parts[1].strip()))
-    return precedence
+        lines = [line for line in file if '->' in line]
+    if not lines:
+        return []
+    pairs = np.atleast_2d(np.genfromtxt(lines, delimiter='->', dtype=str, autostrip=True))
+    if index_of is not None:
+        return [(index_of[a], index_of[b]) for a, b in zip(pairs[:, 0].tolist(), pairs[:, 1].tolist())]
+    return list(zip(pairs[:, 0].tolist(), pairs[:, 1].tolist()))
 
 def calculate_avg_cycle_time(tasks, n_operators):
     """
     Calculate the average cycle time for the tasks.
 
-    :param tasks: A dictionary where keys are task IDs, and values are processing times.
+    :param tasks: The processing times, as an array or a dictionary keyed by task ID.
     :param n_operators: The number of operators available.
     :return: The average cycle time.
     """
+    if isinstance(tasks, np.ndarray):
+        return float(tasks.sum()) / n_operators
     return sum(tasks.values()) / n_operators
 
 def calculate_avg_metabolic_cost(metabolic_costs, n_operators):
     """
     Calculate the average metabolic cost for the tasks.
 
-    :param metabolic_costs: A dictionary where keys are task IDs, and values are metabolic costs.
+    :param metabolic_costs: The metabolic costs, as an array or a dictionary keyed by task ID.
     :param n_operators: The number of operators available.
     :return: The average metabolic cost.
     """
+    if isinstance(metabolic_costs, np.ndarray):
+        return float(metabolic_costs.sum()) / n_operators
     return sum(metabolic_costs.values()) / n_operators
 
 def distribution_considering_both(tasks, metabolic_costs, precedence, cycle_time, max_metabolic_cost, threshold, n_operators):
@@ -180,21 +400,33 @@ def distribution_considering_both(tasks, metabolic_costs, precedence, cycle_time
     :param n_operators: The number of operators available.
     :return: A dictionary where keys are workstation IDs, and values are lists of task IDs assigned to each workstation.
     """
-    dbt = distribution_based_on_time(tasks, metabolic_costs, precedence, cycle_time, threshold, n_operators)
-    Workstation.reset_idx()
-    dbmc = distribution_based_on_metabolic_cost(tasks, metabolic_costs, precedence, max_metabolic_cost, threshold, n_operators)
-    Workstation.reset_idx()
+    # Build the precedence graph once; the two subroutines are independent,
+    # so run them concurrently on the graph and a cheap clone of it.
+    graph = Graph(precedence, tasks, metabolic_costs)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        dbt_future = executor.submit(distribution_based_on_time, tasks, metabolic_costs,
+                                     precedence, cycle_time, threshold, n_operators, graph)
+        dbmc_future = executor.submit(distribution_based_on_metabolic_cost, tasks, metabolic_costs,
+                                      precedence, max_metabolic_cost, threshold, n_operators, graph.clone())
+        dbt = dbt_future.result()
+        dbmc = dbmc_future.result()
+    times = graph.tasks_times
+    mcs = graph.tasks_metabolic_costs
     workstations = {}
 
+    # Task -> workstation maps so every membership test below is O(1)
+    # instead of scanning workstation task lists.
+    dbt_ws_of_task = {task: ws_id for ws_id, ws in dbt.items() for task in ws.get_tasks()}
+    dbmc_ws_of_task = {task: ws_id for ws_id, ws in dbmc.items() for task in ws.get_tasks()}
+
     missing_assignments = []
     for ws_id in dbt:
         if ws_id in dbmc:
             for task in dbt[ws_id].get_tasks():
-                if task in dbmc[ws_id].get_tasks():
+                if dbmc_ws_of_task.get(task) == ws_id:
                     if ws_id not in workstations:
-                        w = Workstation()
-                        workstations[w.id] = w
-                    workstations[w.id].add_task(task, tasks[task], metabolic_costs[task])
+                        workstations[ws_id] = Workstation(ws_id)
+                    workstations[ws_id].add_task(task, times[task], mcs[task])
                 else:
                     missing_assignments.append(task)
 
@@ -202,31 +434,132 @@ def distribution_considering_both(tasks, metabolic_costs, precedence, cycle_time
     for task in missing_assignments:
         best_workstation = None
         workstations_with_task = []
-        for ws_id, workstation in dbt.items():
-            if task in workstation.get_tasks():
-                workstations_with_task.append(workstation)
-        for ws_id, workstation in dbmc.items():
-            if task in workstation.get_tasks():
-                workstations_with_task.append(workstation)
+        if task in dbt_ws_of_task:
+            workstations_with_task.append(dbt[dbt_ws_of_task[task]])
+        if task in dbmc_ws_of_task:
+            workstations_with_task.append(dbmc[dbmc_ws_of_task[task]])
 
         increase_percentages = {}
         for ws in workstations_with_task:
             current_time = ws.cycle_time
             current_metabolic_cost = ws.metabolic_cost
 
-            time_increase_percentage = ((current_time + tasks[task]) / current_time - 1) * 100
-            metabolic_increase_percentage = ((current_metabolic_cost + metabolic_costs[task]) / current_metabolic_cost - 1) * 100
+            # An empty workstation would divide by zero; treat adding the
+            # first task to it as an infinite relative increase.
+            if current_time:
+                time_increase_percentage = ((current_time + times[task]) / current_time - 1) * 100
+            else:
+                time_increase_percentage = float('inf')
+            if current_metabolic_cost:
+                metabolic_increase_percentage = ((current_metabolic_cost + mcs[task]) / current_metabolic_cost - 1) * 100
+            else:
+                metabolic_increase_percentage = float('inf')
             increase_percentages[ws.id] = [time_increase_percentage, metabolic_increase_percentage]
 
         best_workstation = max(increase_percentages, key=lambda x: increase_percentages[x][0])
         if best_workstation:
-            workstations[best_workstation].add_task(task, tasks[task], metabolic_costs[task])
+            if best_workstation not in workstations:
+                # The consensus pass may not have created this station when
+                # the two sub-distributions disagree on its tasks; create it
+                # on demand instead of raising KeyError.
+                workstations[best_workstation] = Workstation(best_workstation)
+            workstations[best_workstation].add_task(task, times[task], mcs[task])
 
     return workstations
 
    
 
-def distribution_based_on_time(tasks, metabolic_costs, precedence, cycle_time, threshold, n_operators):
+_INFINITY = float('inf')
+
+def _scan_normal(sorted_avail, current, limit, threshold_limit, assign_one_more_task):
+    """
+    Selects the next task for a workstation that is not the last one.
+
+    :param sorted_avail: The sorted availability list.
+    :param current: The load already on the workstation.
+    :param limit: The maximum weight allowed per workstation.
+    :param threshold_limit: The relaxed limit including the threshold.
+    :param assign_one_more_task: Whether a forced assignment is still owed.
+    :return: A tuple containing the selected task (or None to close the workstation) and the updated forced-assignment flag.
+    """
+    n_fit = bisect.bisect_right(sorted_avail, (limit - current, _INFINITY))
+    if n_fit:
+        return sorted_avail[n_fit - 1][1], assign_one_more_task
+    lowest_weight, lowest_task = sorted_avail[0]
+    if current + lowest_weight <= threshold_limit or assign_one_more_task:
+        return lowest_task, False
+    return None, assign_one_more_task
+
+def _scan_final(sorted_avail, current, limit, threshold_limit, assign_one_more_task):
+    """
+    Selects the next task for the last workstation, which must accept the
+    lowest-weight task when nothing fits.
+
+    :param sorted_avail: The sorted availability list.
+    :param current: The load already on the workstation.
+    :param limit: The maximum weight allowed per workstation.
+    :param threshold_limit: The relaxed limit including the threshold.
+    :param assign_one_more_task: Whether a forced assignment is still owed.
+    :return: A tuple containing the selected task and the updated forced-assignment flag.
+    """
+    n_fit = bisect.bisect_right(sorted_avail, (limit - current, _INFINITY))
+    if n_fit:
+        return sorted_avail[n_fit - 1][1], assign_one_more_task
+    return sorted_avail[0][1], False
+
+def _greedy(graph, weights, limit, threshold_limit, n_operators, sorted_avail):
+    """
+    Greedy distribution of tasks over a single weight dimension. Both public
+    distribution functions delegate here, so there is one loop to optimize
+    and one signature for the compiled kernel to specialize on. Each
+    workstation takes the largest available task that still fits; when none
+    fits, the lowest-weight task is forced in under the threshold or
+    last-operator rules.
+
+    :param graph: The Graph to distribute.
+    :param weights: The weight array driving the distribution (times or metabolic costs).
+    :param limit: The maximum weight allowed per workstation.
+    :param threshold_limit: The relaxed limit including the threshold.
+    :param n_operators: The number of operators available.
+    :param sorted_avail: The graph's sorted availability list for the chosen dimension.
+    :return: A dictionary where keys are workstation IDs, and values are Workstation objects.
+    """
+    if njit is not None:
+        return _run_greedy_compiled(graph, weights, sorted_avail, limit, threshold_limit, n_operators)
+    ws_id = 1
+    order = []
+    ws_of = []
+    current = 0.0
+
+    # Local bindings so the loop body avoids repeated attribute lookups.
+    available_tasks = graph.available_tasks
+    remove_task = graph.remove_task
+    order_append = order.append
+    ws_of_append = ws_of.append
+
+    # The last-operator check holds for exactly one workstation; dispatch
+    # to a specialized scan at workstation switches instead of re-testing
+    # it on every iteration.
+    scan = _scan_final if ws_id == n_operators else _scan_normal
+    assign_one_more_task = True
+    while available_tasks:
+        task_to_assign, assign_one_more_task = scan(
+            sorted_avail, current, limit, threshold_limit, assign_one_more_task)
+
+        if task_to_assign is not None:
+            order_append(task_to_assign)
+            ws_of_append(ws_id)
+            current += weights[task_to_assign]
+            remove_task(task_to_assign)
+        else:
+            # Move to the next workstation
+            ws_id += 1
+            current = 0.0
+            scan = _scan_final if ws_id == n_operators else _scan_normal
+
+    return _workstations_from_assignment(graph, order, ws_of, ws_id)
+
+def distribution_based_on_time(tasks, metabolic_costs, precedence, cycle_time, threshold, n_operators, graph=None):
     """
     Solve with cycle time constraint.
     
@@ -235,43 +568,16 @@ def distribution_based_on_time(tasks, metabolic_costs, precedence, cycle_time, t
     :param precedence: A list of tuples representing precedence constraints.
     :param cycle_time: The maximum time allowed per workstation.
     :param threshold: The threshold for the percentage of additional task effort to be added.
+    :param graph: An optional prebuilt Graph to reuse instead of building one.
     :return: A dictionary where keys are workstation IDs, and values are lists of task IDs assigned to each workstation.
     """
-    # Step 1: Build the precedence graph
-    graph = Graph(precedence, tasks, metabolic_costs)
-    workstations = {1: Workstation()}
-    workstation = workstations[1]
-    
-    assign_one_more_task = True
-    while graph.available_tasks:
-        current_time = workstation.cycle_time
-        task_to_assign = None
-        for task in graph.available_tasks:
-            if (current_time + tasks[task] <= cycle_time):
-                task_to_assign = task
-                break
-            elif current_time + tasks[task] <= cycle_time + (threshold/100 * cycle_time):
-                assign_one_more_task = True
-                break
-            elif workstation.id == n_operators:
-                assign_one_more_task = True
-                break
-
-        if task_to_assign is None and assign_one_more_task:
-            assign_one_more_task = False
-            task_to_assign = graph.get_lowest_time_task()
-        
-        if task_to_assign:
-            workstation.add_task(task_to_assign, tasks[task_to_assign], metabolic_costs[task_to_assign])
-            graph.remove_task(task_to_assign)
-        else:
-            # Move to the next workstation
-            workstation = Workstation()
-            workstations[workstation.id] = workstation
-            
-    return workstations
+    if graph is None:
+        graph = Graph(precedence, tasks, metabolic_costs)
+    return _greedy(graph, graph.tasks_times, cycle_time,
+                   cycle_time * (1 + threshold / 100), n_operators,
+                   graph.sorted_by_time)
 
-def distribution_based_on_metabolic_cost(tasks, metabolic_costs, precedence, max_metabolic_cost, threshold, n_operators):
+def distribution_based_on_metabolic_cost(tasks, metabolic_costs, precedence, max_metabolic_cost, threshold, n_operators, graph=None):
     """
     Solve with metabolic cost constraint.
     
@@ -280,41 +586,14 @@ def distribution_based_on_metabolic_cost(tasks, metabolic_costs, precedence, max
     :param precedence: A list of tuples representing precedence constraints.
     :param max_metabolic_cost: The maximum metabolic cost allowed per workstation.
     :param threshold: The threshold for the percentage of additional task effort to be added.
+    :param graph: An optional prebuilt Graph to reuse instead of building one.
     :return: A dictionary where keys are workstation IDs, and values are lists of task IDs assigned to each workstation.
     """
-    # Step 1: Build the precedence graph
-    graph = Graph(precedence, tasks, metabolic_costs)
-    workstations = {1: Workstation()}
-    workstation = workstations[1]
-    
-    assign_one_more_task = True
-    while graph.available_tasks:
-        current_metabolic_cost = workstation.metabolic_cost
-        task_to_assign = None
-        for task in graph.available_tasks:
-            if (current_metabolic_cost + metabolic_costs[task] <= max_metabolic_cost):
-                task_to_assign = task
-                break
-            elif current_metabolic_cost + metabolic_costs[task] <= max_metabolic_cost + (threshold/100 * max_metabolic_cost):
-                assign_one_more_task = True
-                break
-            elif workstation.id == n_operators:
-                assign_one_more_task = True
-                break
-
-        if task_to_assign is None and assign_one_more_task:
-            assign_one_more_task = False
-            task_to_assign = graph.get_lowest_metabolic_cost_task()
-        
-        if task_to_assign:
-            workstation.add_task(task_to_assign, tasks[task_to_assign], metabolic_costs[task_to_assign])
-            graph.remove_task(task_to_assign)
-        else:
-            # Move to the next workstation
-            workstation = Workstation()
-            workstations[workstation.id] = workstation
-            
-    return workstations
+    if graph is None:
+        graph = Graph(precedence, tasks, metabolic_costs)
+    return _greedy(graph, graph.tasks_metabolic_costs, max_metabolic_cost,
+                   max_metabolic_cost * (1 + threshold / 100), n_operators,
+                   graph.sorted_by_metabolic_cost)
 
 def plot_results(data, time_objective, metabolic_cost_objective):
     """
@@ -324,6 +603,10 @@ def plot_results(data, time_objective, metabolic_cost_objective):
     :param time_objective: The objective value for the cycle time.
     :param metabolic_cost_objective: The objective value for the metabolic cost.
     """
+    # Imported lazily: solver-only callers never pay the matplotlib
+    # import cost or memory footprint.
+    import matplotlib.pyplot as plt
+
     # Extracting keys and values
     keys = list(data.keys())
     values1 = [v[0] for v in data.values()]
@@ -1,5 +1,22 @@
-from collections import defaultdict
-import matplotlib.pyplot as plt
+import bisect
+from collections import namedtuple
+import heapq
+from math import fsum
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    # Built by scheduler_aot.py; precompiled machine code with no JIT warm-up.
+    from _scheduler_aot import schedule as _schedule_aot
+except ImportError:
+    _schedule_aot = None
+
+# Translation between string task IDs and the integer indices used internally.
+IndexMap = namedtuple('IndexMap', ['task_ids', 'index_of'])
 
 class Workstation:
     idx = 1
@@ -57,115 +74,385 @@ class Workstation:
 
 class Graph:
     def __init__(self, precedence, tasks, metabolic_costs):
-        self.task_graph, self.indegree = self.build_precedence_graph(precedence)
-        self.available_tasks = [task for task in self.task_graph if self.indegree[task] == 0]
-        self.tasks_times = tasks
-        self.tasks_metabolic_costs = metabolic_costs
+        if isinstance(tasks, np.ndarray):
+            # Arrays from read_data_file are already indexed by integer task
+            # id, with precedence given as integer pairs.
+            self.task_ids = list(range(tasks.shape[0]))
+            self.index_of = None
+            self.times = tasks
+            self.metabolic_costs = metabolic_costs
+            edges = precedence
+        else:
+            # Intern string task IDs to contiguous integer indices and keep
+            # the weights as parallel float64 arrays; the scheduling loops
+            # then index arrays instead of hashing strings.
+            self.task_ids = list(tasks)
+            self.index_of = {task_id: index for index, task_id in enumerate(self.task_ids)}
+            self.times = np.fromiter(tasks.values(), dtype=np.float64)
+            self.metabolic_costs = np.fromiter(metabolic_costs.values(), dtype=np.float64)
+            index_of = self.index_of
+            edges = [(index_of[a], index_of[b]) for a, b in precedence]
+        self.adj_flat, self.adj_offsets, self.indegree = self.build_precedence_graph(edges)
+        ready = np.flatnonzero(self.indegree == 0)
+        # Availability is a bitmap plus a counter: removal just clears a bit,
+        # and the ready structures below drop dead entries lazily.
+        self.alive = np.zeros(len(self.task_ids), dtype=np.bool_)
+        self.alive[ready] = True
+        self.n_ready = len(ready)
+        # Ready queues ordered by time and by metabolic cost. Entries are
+        # discarded lazily: a popped task is only valid while its bit is set.
+        self._ready_by_time = [(self.times[task], int(task)) for task in ready]
+        self._ready_by_metabolic_cost = [(self.metabolic_costs[task], int(task)) for task in ready]
+        heapq.heapify(self._ready_by_time)
+        heapq.heapify(self._ready_by_metabolic_cost)
+        # Static priority ranks by descending positional weight; the ready
+        # lists below stay sorted by rank so the scheduler always sees the
+        # highest-priority candidates first.
+        self.rank_by_time = self._priority_rank(self.times)
+        self.rank_by_metabolic_cost = self._priority_rank(self.metabolic_costs)
+        self._ready_time_priority = sorted((int(self.rank_by_time[task]), int(task)) for task in ready)
+        self._ready_metabolic_cost_priority = sorted((int(self.rank_by_metabolic_cost[task]), int(task)) for task in ready)
 
     def build_precedence_graph(self, precedence):
         """
-        Builds the precedence graph and indegree dictionary.
+        Builds the precedence graph in compressed-sparse-row form.
 
-        :param precedence: A list of tuples representing precedence constraints.
-        :return: A tuple containing the precedence graph and indegree dictionary.
+        :param precedence: A list of integer task index pairs representing
+            precedence constraints.
+        :return: A tuple of (adj_flat, adj_offsets, indegree) arrays, where
+            the successors of task i are adj_flat[adj_offsets[i]:adj_offsets[i + 1]].
         """
-        task_graph = defaultdict(list)
-        indegree = defaultdict(int)
+        n = len(self.task_ids)
+        out_degree = np.zeros(n + 1, dtype=np.int64)
+        indegree = np.zeros(n, dtype=np.int64)
         for a, b in precedence:
-            task_graph[a].append(b)
+            out_degree[a + 1] += 1
             indegree[b] += 1
-        return task_graph, indegree
+        adj_offsets = np.cumsum(out_degree)
+        adj_flat = np.empty(int(adj_offsets[-1]), dtype=np.int64)
+        cursor = adj_offsets[:-1].copy()
+        for a, b in precedence:
+            adj_flat[cursor[a]] = b
+            cursor[a] += 1
+        return adj_flat, adj_offsets, indegree
+
+    def _priority_rank(self, weights):
+        """
+        Ranks tasks by descending positional weight.
+
+        The positional weight of a task is its own weight plus the positional
+        weights of its successors, computed in one reverse-topological pass
+        over the CSR graph.
+
+        :param weights: The per-task weight array (times or metabolic costs).
+        :return: A numpy array mapping each task to its priority rank, with
+            rank 0 for the largest positional weight.
+        """
+        n = len(self.task_ids)
+        adj_flat = self.adj_flat
+        adj_offsets = self.adj_offsets
+        indegree = self.indegree.copy()
+        topological_order = [task for task in range(n) if indegree[task] == 0]
+        head = 0
+        while head < len(topological_order):
+            task = topological_order[head]
+            head += 1
+            for k in range(adj_offsets[task], adj_offsets[task + 1]):
+                dependent_task = int(adj_flat[k])
+                indegree[dependent_task] -= 1
+                if indegree[dependent_task] == 0:
+                    topological_order.append(dependent_task)
+        positional_weight = weights.copy()
+        for task in reversed(topological_order):
+            for k in range(adj_offsets[task], adj_offsets[task + 1]):
+                positional_weight[task] += positional_weight[int(adj_flat[k])]
+        priority = sorted(range(n), key=lambda task: (-positional_weight[task], task))
+        rank = np.empty(n, dtype=np.int64)
+        rank[priority] = np.arange(n)
+        return rank
+
+    def _ready_priority_array(self, ready):
+        """
+        Materializes the alive entries of a priority-sorted ready list,
+        compacting the list once more than half its entries are dead.
+
+        :param ready: A rank-sorted list of (rank, task) entries.
+        :return: A numpy array of available task indices, highest priority first.
+        """
+        alive = self.alive
+        if 2 * self.n_ready < len(ready):
+            ready[:] = [entry for entry in ready if alive[entry[1]]]
+        return np.fromiter((task for _, task in ready if alive[task]),
+                           dtype=np.int64, count=self.n_ready)
+
+    def ready_by_time_priority(self):
+        """
+        Returns the available tasks ordered by time-based priority.
+
+        :return: A numpy array of available task indices, highest priority first.
+        """
+        return self._ready_priority_array(self._ready_time_priority)
+
+    def ready_by_metabolic_cost_priority(self):
+        """
+        Returns the available tasks ordered by metabolic-cost-based priority.
+
+        :return: A numpy array of available task indices, highest priority first.
+        """
+        return self._ready_priority_array(self._ready_metabolic_cost_priority)
 
     def remove_task(self, task):
         """
-        Removes a task from the graph and updates the available tasks and indegree dictionary.
+        Removes a task from the graph and updates the alive bitmap and indegree array.
 
         :param task: The task to remove.
         """
-        self.available_tasks.remove(task)
-        for dependent_task in self.task_graph[task]:
-            self.indegree[dependent_task] -= 1
-            if self.indegree[dependent_task] == 0:
-                self.available_tasks.append(dependent_task)
-    
+        self.alive[task] = False
+        self.n_ready -= 1
+        indegree = self.indegree
+        adj_flat = self.adj_flat
+        start, end = self.adj_offsets[task:task + 2]
+        for k in range(start, end):
+            dependent_task = int(adj_flat[k])
+            indegree[dependent_task] -= 1
+            if indegree[dependent_task] == 0:
+                self.alive[dependent_task] = True
+                self.n_ready += 1
+                heapq.heappush(self._ready_by_time, (self.times[dependent_task], dependent_task))
+                heapq.heappush(self._ready_by_metabolic_cost, (self.metabolic_costs[dependent_task], dependent_task))
+                bisect.insort(self._ready_time_priority, (int(self.rank_by_time[dependent_task]), dependent_task))
+                bisect.insort(self._ready_metabolic_cost_priority, (int(self.rank_by_metabolic_cost[dependent_task]), dependent_task))
+
+    def _peek_ready(self, ready):
+        """
+        Returns the lowest-weight task on a ready queue, dropping entries
+        whose task's alive bit is cleared.
+
+        :param ready: The ready queue to peek.
+        :return: The task with the lowest weight.
+        """
+        while not self.alive[ready[0][1]]:
+            heapq.heappop(ready)
+        return ready[0][1]
+
     def get_lowest_time_task(self):
         """
         Returns the task with the lowest time.
 
         :return: The task with the lowest time.
         """
-        task_to_assign = self.available_tasks[0]
-        for task in self.available_tasks:
-            if self.tasks_times[task] < self.tasks_times[task_to_assign]:
-                task_to_assign = task
-        return task_to_assign
-    
+        return self._peek_ready(self._ready_by_time)
+
     def get_lowest_metabolic_cost_task(self):
         """
         Returns the task with the lowest metabolic cost.
 
         :return: The task with the lowest metabolic cost.
         """
-        task_to_assign = self.available_tasks[0]
-        for task in self.available_tasks:
-            if self.tasks_metabolic_costs[task] < self.tasks_metabolic_costs[task_to_assign]:
-                task_to_assign = task
-        return task_to_assign
-    
+        return self._peek_ready(self._ready_by_metabolic_cost)
+
+
+def _schedule_core(weights, rank, indegree, adj_flat, adj_offsets, ready_init, limit, threshold_limit, n_operators):
+    """
+    Compiled core of the distribution loop.
+
+    Scans the ready set in priority order and assigns the first task that
+    fits the limit. When nothing fits, the lowest-weight ready task is
+    forced onto the final or an empty workstation, or when it is within
+    the threshold allowance; otherwise the station closes.
+
+    :param weights: The per-task weight array (times or metabolic costs).
+    :param rank: The per-task priority rank array; the ready set is kept
+        sorted ascending by rank.
+    :param indegree: The indegree array; decremented in place.
+    :param adj_flat: The flattened successor array (CSR values).
+    :param adj_offsets: The per-task offsets into adj_flat (CSR offsets).
+    :param ready_init: The initially available task indices, sorted by rank.
+    :param limit: The per-workstation weight limit.
+    :param threshold_limit: The limit including the threshold allowance.
+    :param n_operators: The number of operators available.
+    :return: A tuple of (assignment order, workstation per assignment,
+        last workstation id).
+    """
+    n = weights.shape[0]
+    ready = np.empty(n, np.int64)
+    ready_n = ready_init.shape[0]
+    for i in range(ready_n):
+        ready[i] = ready_init[i]
+    order = np.empty(n, np.int64)
+    ws_of = np.empty(n, np.int64)
+    n_assigned = 0
+    ws_id = 1
+    current = 0.0
+    station_size = 0
+    while ready_n > 0:
+        task = -1
+        for i in range(ready_n):
+            if current + weights[ready[i]] <= limit:
+                task = ready[i]
+                break
+
+        if task == -1:
+            best = 0
+            best_weight = weights[ready[0]]
+            for i in range(1, ready_n):
+                w = weights[ready[i]]
+                if w < best_weight:
+                    best = i
+                    best_weight = w
+            # Force the lowest-weight task onto the final workstation, onto
+            # an empty workstation (it could never fit anywhere), or when it
+            # is within the threshold allowance; otherwise close the station.
+            if ws_id == n_operators or station_size == 0 or current + best_weight <= threshold_limit:
+                task = ready[best]
+
+        if task != -1:
+            pos = 0
+            while ready[pos] != task:
+                pos += 1
+            for i in range(pos, ready_n - 1):
+                ready[i] = ready[i + 1]
+            ready_n -= 1
+            order[n_assigned] = task
+            ws_of[n_assigned] = ws_id
+            n_assigned += 1
+            station_size += 1
+            current += weights[task]
+            for k in range(adj_offsets[task], adj_offsets[task + 1]):
+                dependent_task = adj_flat[k]
+                indegree[dependent_task] -= 1
+                if indegree[dependent_task] == 0:
+                    dependent_rank = rank[dependent_task]
+                    lo = 0
+                    hi = ready_n
+                    while lo < hi:
+                        mid = (lo + hi) >> 1
+                        if rank[ready[mid]] < dependent_rank:
+                            lo = mid + 1
+                        else:
+                            hi = mid
+                    for i in range(ready_n, lo, -1):
+                        ready[i] = ready[i - 1]
+                    ready[lo] = dependent_task
+                    ready_n += 1
+        else:
+            # Move to the next workstation
+            ws_id += 1
+            current = 0.0
+            station_size = 0
+    return order[:n_assigned], ws_of[:n_assigned], ws_id
+
+
+if njit is not None:
+    _schedule_core = njit(cache=True, nogil=True)(_schedule_core)
+
+
+def _run_schedule_core(graph, weights, rank, ready_init, limit, threshold_limit, n_operators):
+    """
+    Runs the compiled scheduler over a graph and rebuilds the workstation
+    dictionary from the flat assignment arrays.
+
+    :param graph: The Graph to schedule.
+    :param weights: The per-task weight array (times or metabolic costs).
+    :param rank: The per-task priority rank array.
+    :param ready_init: The initially available task indices, sorted by rank.
+    :param limit: The per-workstation weight limit.
+    :param threshold_limit: The limit including the threshold allowance.
+    :param n_operators: The number of operators available.
+    :return: A dictionary where keys are workstation IDs, and values are Workstation objects.
+    """
+    core = _schedule_aot if _schedule_aot is not None else _schedule_core
+    order, ws_of, last_ws_id = core(
+        weights, rank, graph.indegree.copy(), graph.adj_flat, graph.adj_offsets,
+        ready_init, limit, threshold_limit, n_operators)
+    return _workstations_from_assignment(graph, order, ws_of, last_ws_id)
+
+
+def _workstations_from_assignment(graph, order, ws_of, last_ws_id):
+    """
+    Rebuilds the workstation dictionary from flat assignment arrays.
+
+    :param graph: The Graph the assignment was computed for.
+    :param order: The tasks in assignment order.
+    :param ws_of: The workstation id per assignment.
+    :param last_ws_id: The highest workstation id used.
+    :return: A dictionary where keys are workstation IDs, and values are Workstation objects.
+    """
+    workstations = {}
+    # Key by the kernel's 1-based station ids rather than the class counter,
+    # so repeated runs agree with ws_of without a reset_idx in between.
+    for ws_id in range(1, int(last_ws_id) + 1):
+        workstation = Workstation()
+        workstation.id = ws_id
+        workstations[ws_id] = workstation
+    times = graph.times
+    task_metabolic_costs = graph.metabolic_costs
+    for task, ws_id in zip(order, ws_of):
+        task = int(task)
+        workstations[int(ws_id)].add_task(task, times[task], task_metabolic_costs[task])
+    return workstations
+
 
 def read_data_file(data_file):
     """
-    Reads the task data file and returns a dictionary of task times and metabolic costs.
-    
+    Reads the task data file into parallel numpy arrays.
+
     :param data_file: Path to the data file.
-    :return: A dictionary of tasks with their times and metabolic costs.
+    :return: A tuple of (times, metabolic_costs, index_map): two contiguous
+        float64 arrays indexed by integer task id, and an IndexMap for
+        translating string task IDs at the API boundary.
     """
-    tasks = {}
-    metabolic_costs = {}
-    with open(data_file, 'r') as file:
-        for line in file:
-            parts = line.strip().split()
-            task_id = parts[0]
-            time = float(parts[1])
-            metabolic_cost = float(parts[2])
-            tasks[task_id] = time
-            metabolic_costs[task_id] = metabolic_cost
-    return tasks, metabolic_costs
-
-def read_precedence_file(precedence_file):
+    data = np.atleast_1d(np.loadtxt(data_file, dtype=[('task', 'U32'), ('time', 'f8'), ('metabolic_cost', 'f8')]))
+    times = np.ascontiguousarray(data['time'])
+    metabolic_costs = np.ascontiguousarray(data['metabolic_cost'])
+    task_ids = data['task'].tolist()
+    index_map = IndexMap(task_ids, {task_id: index for index, task_id in enumerate(task_ids)})
+    return times, metabolic_costs, index_map
+
+def read_precedence_file(precedence_file, index_map=None):
     """
     Reads the precedence file and returns a list of precedence constraints.
     
     :param precedence_file: Path to the precedence file.
+    :param index_map: Optional IndexMap; when given, the edges are returned
+        as integer task index pairs instead of string ID pairs.
     :return: A list of tuples representing precedence constraints.
     """
-    precedence = []
     with open(precedence_file, 'r') as file:
-        for line in file:
-            if '->' in line:
-                parts = line.strip().split('->')
-                precedence.append((parts[0].strip(), parts[1].strip()))
-    return precedence
+        text = file.read()
+    pairs = [(a.strip(), b.strip())
+             for line in text.splitlines() if '->' in line
+             for a, b in [line.split('->')]]
+    if index_map is None:
+        return pairs
+    index_of = index_map.index_of
+    return [(index_of[a], index_of[b]) for a, b in pairs]
 
 def calculate_avg_cycle_time(tasks, n_operators):
     """
     Calculate the average cycle time for the tasks.
 
-    :param tasks: A dictionary where keys are task IDs, and values are processing times.
+    :param tasks: Task processing times, as a dictionary keyed by task ID or
+        as a numpy array.
     :param n_operators: The number of operators available.
     :return: The average cycle time.
     """
-    return sum(tasks.values()) / n_operators
+    if isinstance(tasks, np.ndarray):
+        return tasks.sum() / n_operators
+    return fsum(tasks.values()) / n_operators
 
 def calculate_avg_metabolic_cost(metabolic_costs, n_operators):
     """
     Calculate the average metabolic cost for the tasks.
 
-    :param metabolic_costs: A dictionary where keys are task IDs, and values are metabolic costs.
+    :param metabolic_costs: Task metabolic costs, as a dictionary keyed by
+        task ID or as a numpy array.
     :param n_operators: The number of operators available.
     :return: The average metabolic cost.
     """
-    return sum(metabolic_costs.values()) / n_operators
+    if isinstance(metabolic_costs, np.ndarray):
+        return metabolic_costs.sum() / n_operators
+    return fsum(metabolic_costs.values()) / n_operators
 
 def distribution_considering_both(tasks, metabolic_costs, precedence, cycle_time, max_metabolic_cost, threshold, n_operators):
     """
@@ -180,6 +467,12 @@ def distribution_considering_both(tasks, metabolic_costs, precedence, cycle_time
     :param n_operators: The number of operators available.
     :return: A dictionary where keys are workstation IDs, and values are lists of task IDs assigned to each workstation.
     """
+    if isinstance(tasks, np.ndarray):
+        times = tasks
+        task_metabolic_costs = metabolic_costs
+    else:
+        times = np.fromiter(tasks.values(), dtype=np.float64)
+        task_metabolic_costs = np.fromiter(metabolic_costs.values(), dtype=np.float64)
     dbt = distribution_based_on_time(tasks, metabolic_costs, precedence, cycle_time, threshold, n_operators)
     Workstation.reset_idx()
     dbmc = distribution_based_on_metabolic_cost(tasks, metabolic_costs, precedence, max_metabolic_cost, threshold, n_operators)
@@ -189,12 +482,13 @@ def distribution_considering_both(tasks, metabolic_costs, precedence, cycle_time
     missing_assignments = []
     for ws_id in dbt:
         if ws_id in dbmc:
+            dbmc_tasks = set(dbmc[ws_id].get_tasks())
             for task in dbt[ws_id].get_tasks():
-                if task in dbmc[ws_id].get_tasks():
+                if task in dbmc_tasks:
                     if ws_id not in workstations:
                         w = Workstation()
                         workstations[w.id] = w
-                    workstations[w.id].add_task(task, tasks[task], metabolic_costs[task])
+                    workstations[w.id].add_task(task, times[task], task_metabolic_costs[task])
                 else:
                     missing_assignments.append(task)
 
@@ -214,13 +508,20 @@ def distribution_considering_both(tasks, metabolic_costs, precedence, cycle_time
             current_time = ws.cycle_time
             current_metabolic_cost = ws.metabolic_cost
 
-            time_increase_percentage = ((current_time + tasks[task]) / current_time - 1) * 100
-            metabolic_increase_percentage = ((current_metabolic_cost + metabolic_costs[task]) / current_metabolic_cost - 1) * 100
+            time_increase_percentage = ((current_time + times[task]) / current_time - 1) * 100
+            metabolic_increase_percentage = ((current_metabolic_cost + task_metabolic_costs[task]) / current_metabolic_cost - 1) * 100
             increase_percentages[ws.id] = [time_increase_percentage, metabolic_increase_percentage]
 
         best_workstation = max(increase_percentages, key=lambda x: increase_percentages[x][0])
         if best_workstation:
-            workstations[best_workstation].add_task(task, tasks[task], metabolic_costs[task])
+            if best_workstation not in workstations:
+                # The consensus pass may not have created this station when
+                # the two sub-distributions disagree on its tasks; create it
+                # on demand instead of raising KeyError.
+                workstation = Workstation()
+                workstation.id = best_workstation
+                workstations[best_workstation] = workstation
+            workstations[best_workstation].add_task(task, times[task], task_metabolic_costs[task])
 
     return workstations
 
@@ -239,37 +540,51 @@ def distribution_based_on_time(tasks, metabolic_costs, precedence, cycle_time, t
     """
     # Step 1: Build the precedence graph
     graph = Graph(precedence, tasks, metabolic_costs)
-    workstations = {1: Workstation()}
-    workstation = workstations[1]
-    
-    assign_one_more_task = True
-    while graph.available_tasks:
-        current_time = workstation.cycle_time
+    times = graph.times
+    threshold_limit = cycle_time + (threshold / 100 * cycle_time)
+    if njit is not None or _schedule_aot is not None:
+        return _run_schedule_core(graph, times, graph.rank_by_time,
+                                  graph.ready_by_time_priority(),
+                                  cycle_time, threshold_limit, n_operators)
+    # Bind the hot graph lookups to locals for the interpreted loop. The
+    # assignment is accumulated flat and turned into Workstations at the end.
+    ready_priority = graph.ready_by_time_priority
+    remove_task = graph.remove_task
+    order = []
+    ws_of = []
+    order_append = order.append
+    ws_of_append = ws_of.append
+    ws_id = 1
+    current_time = 0.0
+    station_size = 0
+    while graph.n_ready:
+        available = ready_priority()
+        projected = current_time + times[available]
+        fits = projected <= cycle_time
         task_to_assign = None
-        for task in graph.available_tasks:
-            if (current_time + tasks[task] <= cycle_time):
-                task_to_assign = task
-                break
-            elif current_time + tasks[task] <= cycle_time + (threshold/100 * cycle_time):
-                assign_one_more_task = True
-                break
-            elif workstation.id == n_operators:
-                assign_one_more_task = True
-                break
-
-        if task_to_assign is None and assign_one_more_task:
-            assign_one_more_task = False
-            task_to_assign = graph.get_lowest_time_task()
-        
-        if task_to_assign:
-            workstation.add_task(task_to_assign, tasks[task_to_assign], metabolic_costs[task_to_assign])
-            graph.remove_task(task_to_assign)
+        if fits.any():
+            task_to_assign = int(available[int(fits.argmax())])
+        else:
+            # Force the lowest-weight task onto the final workstation, onto
+            # an empty workstation (it could never fit anywhere), or when it
+            # is within the threshold allowance; otherwise close the station.
+            best = int(projected.argmin())
+            if ws_id == n_operators or station_size == 0 or projected[best] <= threshold_limit:
+                task_to_assign = int(available[best])
+
+        if task_to_assign is not None:
+            order_append(task_to_assign)
+            ws_of_append(ws_id)
+            station_size += 1
+            current_time += times[task_to_assign]
+            remove_task(task_to_assign)
         else:
             # Move to the next workstation
-            workstation = Workstation()
-            workstations[workstation.id] = workstation
-            
-    return workstations
+            ws_id += 1
+            current_time = 0.0
+            station_size = 0
+
+    return _workstations_from_assignment(graph, order, ws_of, ws_id)
 
 def distribution_based_on_metabolic_cost(tasks, metabolic_costs, precedence, max_metabolic_cost, threshold, n_operators):
     """
@@ -284,37 +599,51 @@ def distribution_based_on_metabolic_cost(tasks, metabolic_costs, precedence, max
     """
     # Step 1: Build the precedence graph
     graph = Graph(precedence, tasks, metabolic_costs)
-    workstations = {1: Workstation()}
-    workstation = workstations[1]
-    
-    assign_one_more_task = True
-    while graph.available_tasks:
-        current_metabolic_cost = workstation.metabolic_cost
+    task_metabolic_costs = graph.metabolic_costs
+    threshold_limit = max_metabolic_cost + (threshold / 100 * max_metabolic_cost)
+    if njit is not None or _schedule_aot is not None:
+        return _run_schedule_core(graph, task_metabolic_costs, graph.rank_by_metabolic_cost,
+                                  graph.ready_by_metabolic_cost_priority(),
+                                  max_metabolic_cost, threshold_limit, n_operators)
+    # Bind the hot graph lookups to locals for the interpreted loop. The
+    # assignment is accumulated flat and turned into Workstations at the end.
+    ready_priority = graph.ready_by_metabolic_cost_priority
+    remove_task = graph.remove_task
+    order = []
+    ws_of = []
+    order_append = order.append
+    ws_of_append = ws_of.append
+    ws_id = 1
+    current_metabolic_cost = 0.0
+    station_size = 0
+    while graph.n_ready:
+        available = ready_priority()
+        projected = current_metabolic_cost + task_metabolic_costs[available]
+        fits = projected <= max_metabolic_cost
         task_to_assign = None
-        for task in graph.available_tasks:
-            if (current_metabolic_cost + metabolic_costs[task] <= max_metabolic_cost):
-                task_to_assign = task
-                break
-            elif current_metabolic_cost + metabolic_costs[task] <= max_metabolic_cost + (threshold/100 * max_metabolic_cost):
-                assign_one_more_task = True
-                break
-            elif workstation.id == n_operators:
-                assign_one_more_task = True
-                break
-
-        if task_to_assign is None and assign_one_more_task:
-            assign_one_more_task = False
-            task_to_assign = graph.get_lowest_metabolic_cost_task()
-        
-        if task_to_assign:
-            workstation.add_task(task_to_assign, tasks[task_to_assign], metabolic_costs[task_to_assign])
-            graph.remove_task(task_to_assign)
+        if fits.any():
+            task_to_assign = int(available[int(fits.argmax())])
+        else:
+            # Force the lowest-weight task onto the final workstation, onto
+            # an empty workstation (it could never fit anywhere), or when it
+            # is within the threshold allowance; otherwise close the station.
+            best = int(projected.argmin())
+            if ws_id == n_operators or station_size == 0 or projected[best] <= threshold_limit:
+                task_to_assign = int(available[best])
+
+        if task_to_assign is not None:
+            order_append(task_to_assign)
+            ws_of_append(ws_id)
+            station_size += 1
+            current_metabolic_cost += task_metabolic_costs[task_to_assign]
+            remove_task(task_to_assign)
         else:
             # Move to the next workstation
-            workstation = Workstation()
-            workstations[workstation.id] = workstation
-            
-    return workstations
+            ws_id += 1
+            current_metabolic_cost = 0.0
+            station_size = 0
+
+    return _workstations_from_assignment(graph, order, ws_of, ws_id)
 
 def plot_results(data, time_objective, metabolic_cost_objective):
     """
@@ -324,19 +653,22 @@ def plot_results(data, time_objective, metabolic_cost_objective):
     :param time_objective: The objective value for the cycle time.
     :param metabolic_cost_objective: The objective value for the metabolic cost.
     """
+    # Imported lazily so batch runs that never plot skip the backend setup.
+    import matplotlib.pyplot as plt
+
     # Extracting keys and values
     keys = list(data.keys())
-    values1 = [v[0] for v in data.values()]
-    values2 = [v[1] for v in data.values()]
+    values = np.array(list(data.values()), dtype=np.float64)
 
     print(keys)
-    print(values1)
-    print(values2)
+    print(values[:, 0].tolist())
+    print(values[:, 1].tolist())
 
-    # Plotting
+    # Plotting; matplotlib converts to numpy internally, so hand it the
+    # arrays directly.
     plt.figure(figsize=(16, 6))
-    plt.bar(keys, values1, width=0.4, label='Cycle time', align='center')
-    plt.bar(keys, values2, width=0.4, label='Metabolic cost', align='edge')
+    plt.bar(keys, values[:, 0], width=0.4, label='Cycle time', align='center')
+    plt.bar(keys, values[:, 1], width=0.4, label='Metabolic cost', align='edge')
 
     # Adding objective lines
     plt.axhline(y=time_objective, color='r', linestyle='--', label='Time Objective')
@@ -346,6 +678,7 @@ def plot_results(data, time_objective, metabolic_cost_objective):
     plt.xlabel('Key')
     plt.ylabel('Values')
     plt.title('Bar Chart of Data')
+    plt.xticks(keys)
     plt.legend()
 
     # Display the plot
@@ -16,8 +16,8 @@ def main():
     threshold = args.threshold
 
     # Read data from files
-    tasks, metabolic_costs = read_data_file(data_file)
-    precedence = read_precedence_file(precedence_file)
+    tasks, metabolic_costs, index_map = read_data_file(data_file)
+    precedence = read_precedence_file(precedence_file, index_map)
     cycle_time = calculate_avg_cycle_time(tasks, n_operators)
     max_metabolic_cost = calculate_avg_metabolic_cost(metabolic_costs, n_operators)
     print(f"Cycle time: {cycle_time} and metabolic cost: {max_metabolic_cost}")
@@ -0,0 +1,26 @@
+"""
+Ahead-of-time build for the scheduler kernel.
+
+Running this module compiles _schedule_core into a _scheduler_aot
+extension module, which genetic_algorithm picks up on import so that
+single-shot CLI runs skip the numba JIT warm-up entirely:
+
+    python scheduler_aot.py
+"""
+from numba.pycc import CC
+
+import genetic_algorithm
+
+cc = CC('_scheduler_aot')
+
+_kernel = genetic_algorithm._schedule_core
+if hasattr(_kernel, 'py_func'):
+    _kernel = _kernel.py_func
+
+cc.export(
+    'schedule',
+    'Tuple((i8[:], i8[:], i8))(f8[:], i8[:], i8[:], i8[:], i8[:], i8[:], f8, f8, i8)',
+)(_kernel)
+
+if __name__ == '__main__':
+    cc.compile()